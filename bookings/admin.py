@@ -1,9 +1,237 @@
 from django.contrib import admin
-from .models import Users, Teams, Rooms, Bookings, BookingAttendees
-
-# Register your models here.
-admin.site.register(Users)
-admin.site.register(Teams)
-admin.site.register(Rooms)
-admin.site.register(Bookings)
-admin.site.register(BookingAttendees)
\ No newline at end of file
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from .audit import audit_log, request_actor
+from .models import Users, Teams, Rooms, Bookings, BookingAttendees, Jobs, AuditEvents
+from .utils import cancel_booking, cancel_bookings_bulk, filter_users_by_name
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the planner's row estimate instead of COUNT(*) for unfiltered changelists on large tables.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where:
+            estimate = self._estimate(query.model._meta.db_table, self.object_list.db)
+            if estimate is not None and estimate > self.estimate_threshold:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def _estimate(table, using):
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            elif connection.vendor == 'sqlite':
+                # Only populated once ANALYZE has run
+                cursor.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'")
+                if cursor.fetchone() is None:
+                    return None
+                # The first figure of every stat row is the table row count
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            else:
+                return None
+            row = cursor.fetchone()
+        if row is None or row[0] is None:
+            return None
+        return int(str(row[0]).split()[0])
+
+
+class UncountedPage(Page):
+    def __init__(self, object_list, number, paginator, more):
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        return self.more
+
+
+class UncountedPaginator(Paginator):
+    """
+    Fetches one row past the requested page to tell whether another page follows,
+    so the result is never counted. num_pages and count are not supported.
+    """
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+        return UncountedPage(rows[:self.per_page], number, self, more=len(rows) > self.per_page)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        # Autocomplete widgets only ask whether more results follow; don't COUNT on every keystroke
+        if request.resolver_match and request.resolver_match.url_name == 'autocomplete':
+            return UncountedPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+
+@admin.register(Users)
+class UsersAdmin(LargeTableAdmin):
+    list_display = ['id', 'name', 'age', 'gender']
+    list_filter = ['gender']
+    # Matched through the UserNameTokens index in get_search_results
+    search_fields = ['name']
+    ordering = ['name']
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return filter_users_by_name(queryset, search_term), False
+
+
+@admin.register(Teams)
+class TeamsAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name']
+    search_fields = ['^name']
+    autocomplete_fields = ['members']
+
+
+@admin.register(Rooms)
+class RoomsAdmin(admin.ModelAdmin):
+    list_display = ['room_number', 'room_type', 'capacity']
+    list_filter = ['room_type']
+    search_fields = ['^room_number']
+
+
+class ReadOnlyAdminMixin:
+    """
+    Attendee rows must go through book_slot/cancel_booking so UserSlots,
+    rollup jobs and the audit log stay consistent; the admin only shows them.
+    """
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class BookingAttendeesInline(ReadOnlyAdminMixin, admin.TabularInline):
+    model = BookingAttendees
+    fields = ['user']
+    extra = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
+
+
+@admin.register(Bookings)
+class BookingsAdmin(LargeTableAdmin):
+    list_display = ['booking_code', 'room_number', 'room_type', 'team', 'slot_start', 'slot_end', 'created_at']
+    list_select_related = ['room', 'team']
+    list_filter = ['room__room_type']
+    date_hierarchy = 'slot_start'
+    search_fields = ['=booking_code']
+    autocomplete_fields = ['team']
+    readonly_fields = ['booking_code', 'room', 'slot_start', 'slot_end', 'created_at']
+    inlines = [BookingAttendeesInline]
+    ordering = ['-slot_start']
+
+    def has_add_permission(self, request):
+        # New bookings must be made through the API so book_slot's rules apply
+        return False
+
+    def get_deleted_objects(self, objs, request):
+        # Attendees are removed by cancel_booking, so their read-only admin must not block the delete
+        deleted_objects, model_count, _, protected = super().get_deleted_objects(objs, request)
+        return deleted_objects, model_count, set(), protected
+
+    def delete_model(self, request, obj):
+        booking = cancel_booking(obj.booking_code)
+        audit_log.record(
+            'cancel', 'success', actor=request_actor(request), booking_code=booking.booking_code,
+            room=booking.room.room_number, slot_start=booking.slot_start, team_id=booking.team_id,
+            detail="Cancelled from admin.",
+        )
+
+    def delete_queryset(self, request, queryset):
+        codes = list(queryset.values_list('booking_code', flat=True))
+        summary = cancel_bookings_bulk(booking_codes=codes)
+        actor = request_actor(request)
+        for code, result in summary['results'].items():
+            booking = summary['bookings'].get(code, {})
+            audit_log.record(
+                'cancel_bulk', result, actor=actor, booking_code=code, room=booking.get('room'),
+                slot_start=booking.get('slot_start'), detail="Cancelled from admin.",
+            )
+
+    @admin.display(description='Room', ordering='room__room_number')
+    def room_number(self, obj):
+        return obj.room.room_number
+
+    @admin.display(description='Room type', ordering='room__room_type')
+    def room_type(self, obj):
+        return obj.room.get_room_type_display()
+
+
+@admin.register(BookingAttendees)
+class BookingAttendeesAdmin(ReadOnlyAdminMixin, LargeTableAdmin):
+    list_display = ['id', 'booking_code', 'room_number', 'slot_start', 'user_name']
+    list_select_related = ['booking__room', 'user']
+    list_filter = ['booking__room__room_type']
+    search_fields = ['=booking__booking_code']
+    ordering = ['-id']
+
+    @admin.display(description='Booking', ordering='booking__booking_code')
+    def booking_code(self, obj):
+        return obj.booking.booking_code
+
+    @admin.display(description='Room', ordering='booking__room__room_number')
+    def room_number(self, obj):
+        return obj.booking.room.room_number
+
+    @admin.display(description='Slot', ordering='booking__slot_start')
+    def slot_start(self, obj):
+        return obj.booking.slot_start
+
+    @admin.display(description='User', ordering='user__name')
+    def user_name(self, obj):
+        return obj.user.name
+
+
+@admin.register(Jobs)
+class JobsAdmin(LargeTableAdmin):
+    list_display = ['id', 'task', 'status', 'attempts', 'run_at', 'created_at']
+    list_filter = ['status']
+    ordering = ['run_at']
+
+
+@admin.register(AuditEvents)
+class AuditEventsAdmin(LargeTableAdmin):
+    list_display = ['created_at', 'action', 'result', 'booking_code', 'room', 'slot_start', 'actor']
+    list_filter = ['action', 'result']
+    date_hierarchy = 'created_at'
+    search_fields = ['=booking_code']
+    ordering = ['-created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,169 @@
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Q, Count, Sum
+from django.db.models.functions import ExtractIsoWeekDay
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .jobs import enqueue_on_commit
+from .models import Rooms, Bookings, UtilizationRollups
+
+OPENING_HOUR = 9
+CLOSING_HOUR = 18
+WORKING_HOURS = CLOSING_HOUR - OPENING_HOUR
+
+GROUP_BY_FIELDS = {
+    'room': 'room_id',
+    'room_type': 'room__room_type',
+    'date': 'date',
+    'weekday': 'weekday',
+    'hour': 'hour',
+}
+
+def local_day_start(day):
+    """
+    Aware datetime for local midnight at the start of `day`.
+    Filtering slot_start against these bounds keeps booking_slot_start_idx usable,
+    unlike slot_start__date lookups which wrap the column in a function.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+def _cell_key(room_id, slot_start):
+    local = timezone.localtime(slot_start)
+    return local.date(), local.hour, room_id
+
+def _booking_stats(bookings):
+    return bookings.values('room_id', 'slot_start').annotate(
+        headcount=Count('attendees'),
+        seats=Count('attendees', filter=~Q(attendees__user__age__lt=10)),
+    )
+
+def refresh_utilization(cells):
+    """
+    Recomputes the rollup rows for the given (room_id, slot_start) cells.
+    Each cell holds at most one booking (unique_room_slot), so this is one
+    aggregate query plus one upsert regardless of how many cells changed.
+    """
+    cells = set(cells)
+    if not cells:
+        return
+    rollups = {}
+    for room_id, slot_start in cells:
+        key = date, hour, _ = _cell_key(room_id, slot_start)
+        rollups[key] = UtilizationRollups(date=date, hour=hour, room_id=room_id)
+    stats = _booking_stats(Bookings.objects.filter(
+        room_id__in={room_id for room_id, _ in cells},
+        slot_start__in={slot_start for _, slot_start in cells},
+    ))
+    for row in stats:
+        rollup = rollups.get(_cell_key(row['room_id'], row['slot_start']))
+        if rollup is None:
+            continue
+        rollup.bookings = 1
+        rollup.headcount = row['headcount']
+        rollup.seats = row['seats']
+
+    UtilizationRollups.objects.bulk_create(
+        rollups.values(),
+        update_conflicts=True,
+        unique_fields=['date', 'hour', 'room'],
+        update_fields=['bookings', 'headcount', 'seats'],
+    )
+
+def refresh_utilization_job(cells):
+    refresh_utilization((room_id, parse_datetime(slot_start)) for room_id, slot_start in cells)
+
+def queue_utilization_refresh(cells):
+    """
+    Queues a background refresh of the given cells, committed with the current transaction.
+    """
+    cells = sorted(set(cells))
+    if cells:
+        enqueue_on_commit('bookings.analytics.refresh_utilization_job', cells=cells)
+
+@transaction.atomic
+def rebuild_utilization(date_from=None, date_to=None):
+    """
+    Rebuilds the rollup table from Bookings for the given local date range (inclusive).
+    Returns the number of rollup rows written.
+    """
+    existing = UtilizationRollups.objects.all()
+    bookings = Bookings.objects.all()
+    if date_from is not None:
+        existing = existing.filter(date__gte=date_from)
+        bookings = bookings.filter(slot_start__gte=local_day_start(date_from))
+    if date_to is not None:
+        existing = existing.filter(date__lte=date_to)
+        bookings = bookings.filter(slot_start__lt=local_day_start(date_to + timedelta(days=1)))
+    existing.delete()
+
+    rollups = []
+    for row in _booking_stats(bookings).iterator():
+        date, hour, room_id = _cell_key(row['room_id'], row['slot_start'])
+        rollups.append(UtilizationRollups(
+            date=date, hour=hour, room_id=room_id,
+            bookings=1, headcount=row['headcount'], seats=row['seats'],
+        ))
+    UtilizationRollups.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+def _count_weekdays(date_from, date_to):
+    counts = {weekday: 0 for weekday in range(1, 8)}
+    day = date_from
+    while day <= date_to:
+        counts[day.isoweekday()] += 1
+        day += timedelta(days=1)
+    return counts
+
+def utilization_report(date_from, date_to, group_by='room', room_type=None):
+    """
+    Aggregates rollups over [date_from, date_to] grouped by room, room_type, date, weekday or hour.
+    occupancy_rate is booked room-hours over available room-hours;
+    seat_utilization is seats used over seat-hours on offer.
+    """
+    field = GROUP_BY_FIELDS[group_by]
+    rooms = Rooms.objects.all()
+    rollups = UtilizationRollups.objects.filter(date__gte=date_from, date__lte=date_to)
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+        rollups = rollups.filter(room__room_type=room_type)
+    if group_by == 'weekday':
+        rollups = rollups.annotate(weekday=ExtractIsoWeekDay('date'))
+
+    rows = rollups.values(field).annotate(
+        bookings=Sum('bookings'), headcount=Sum('headcount'), seats=Sum('seats'),
+    ).order_by(field)
+    totals = {row[field]: row for row in rows}
+
+    # Available room-hours and seat-hours per group, derived from the rooms on offer
+    rooms = list(rooms.values('id', 'room_type', 'capacity'))
+    days = (date_to - date_from).days + 1
+    weekdays = _count_weekdays(date_from, date_to)
+    if group_by == 'room':
+        groups = {room['id']: ([room], days * WORKING_HOURS) for room in rooms}
+    elif group_by == 'room_type':
+        groups = {}
+        for room in rooms:
+            groups.setdefault(room['room_type'], ([], days * WORKING_HOURS))[0].append(room)
+    elif group_by == 'date':
+        groups = {date_from + timedelta(days=n): (rooms, WORKING_HOURS) for n in range(days)}
+    elif group_by == 'weekday':
+        groups = {weekday: (rooms, count * WORKING_HOURS) for weekday, count in weekdays.items() if count}
+    else:
+        groups = {hour: (rooms, days) for hour in range(OPENING_HOUR, CLOSING_HOUR)}
+
+    report = []
+    for key, (group_rooms, hours) in groups.items():
+        row = totals.get(key, {})
+        room_hours = len(group_rooms) * hours
+        seat_hours = sum(room['capacity'] for room in group_rooms) * hours
+        bookings = row.get('bookings') or 0
+        seats = row.get('seats') or 0
+        report.append({
+            group_by: key,
+            'bookings': bookings,
+            'headcount': row.get('headcount') or 0,
+            'seats': seats,
+            'occupancy_rate': round(bookings / room_hours, 4) if room_hours else 0.0,
+            'seat_utilization': round(seats / seat_hours, 4) if seat_hours else 0.0,
+        })
+    return report
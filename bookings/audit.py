@@ -0,0 +1,155 @@
+import atexit
+import functools
+import logging
+import os
+import signal
+import threading
+from collections import deque
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from .models import AuditEvents
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIT = {
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,
+    'MAX_BUFFER': 10000,
+}
+
+class AuditLog:
+    """
+    Write-behind buffer for audit events.
+    record() only appends to a bounded in-process deque; a daemon thread writes the
+    buffer with one bulk insert every FLUSH_INTERVAL seconds or as soon as
+    BATCH_SIZE events are waiting. Whatever is left is flushed at interpreter
+    exit, or on SIGTERM/SIGINT once install_signal_handlers() has run. With
+    FLUSH_INTERVAL set to None the thread is not started and full batches are
+    written by the recording thread instead.
+    """
+    def __init__(self):
+        self._events = deque(maxlen=DEFAULT_AUDIT['MAX_BUFFER'])
+        # Re-entrant so a signal handler can flush while the main thread holds them
+        self._lock = threading.RLock()
+        self._flush_lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.dropped = 0
+        atexit.register(self.flush)
+
+    @property
+    def config(self):
+        return {**DEFAULT_AUDIT, **getattr(settings, 'BOOKINGS_AUDIT', {})}
+
+    def record(self, action, result, actor='', booking_code='', room='', slot_start=None,
+               user_ids=None, team_id=None, detail=''):
+        config = self.config
+        event = AuditEvents(
+            created_at=timezone.now(),
+            actor=str(actor)[:64],
+            action=action,
+            result=result,
+            booking_code=booking_code or '',
+            room=room or '',
+            slot_start=slot_start,
+            user_ids=list(user_ids or []),
+            team_id=team_id,
+            detail=detail,
+        )
+        with self._lock:
+            self._resize(config['MAX_BUFFER'])
+            if len(self._events) == self._events.maxlen:
+                # The database has been unreachable for a while; the deque sheds the oldest event
+                self.dropped += 1
+            self._events.append(event)
+            pending = len(self._events)
+
+        if not config['FLUSH_INTERVAL']:
+            if pending >= config['BATCH_SIZE']:
+                self.flush()
+            return
+        self._ensure_thread()
+        if pending >= config['BATCH_SIZE']:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Writes every buffered event. Events are put back if the insert fails.
+        Returns the number of events written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                events = list(self._events)
+                self._events.clear()
+            if not events:
+                return 0
+            try:
+                AuditEvents.objects.bulk_create(events, batch_size=self.config['BATCH_SIZE'])
+            except Exception:
+                logger.exception("Failed to flush %s audit events", len(events))
+                with self._lock:
+                    # Put the batch back ahead of newer events, still keeping only the newest MAX_BUFFER
+                    combined = events + list(self._events)
+                    overflow = max(len(combined) - self._events.maxlen, 0)
+                    self.dropped += overflow
+                    self._events = deque(combined[overflow:], maxlen=self._events.maxlen)
+                return 0
+            return len(events)
+
+    def _resize(self, max_buffer):
+        # Called with self._lock held; picks up MAX_BUFFER changes from settings
+        if self._events.maxlen != max_buffer:
+            self._events = deque(self._events, maxlen=max_buffer)
+
+    def pending(self):
+        with self._lock:
+            return len(self._events)
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='bookings-audit', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.config['FLUSH_INTERVAL'])
+            self._wake.clear()
+            self.flush()
+            # The flusher thread owns its own connection; don't hold it between batches
+            connection.close()
+
+audit_log = AuditLog()
+
+def install_signal_handlers(signals=(signal.SIGTERM, signal.SIGINT)):
+    """
+    Flushes the audit buffer before the given signals reach their previous handler.
+    atexit does not run when a signal kills the process. Only the main thread
+    may install handlers, so this is a no-op anywhere else.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in signals:
+        signal.signal(signum, functools.partial(_flush_and_chain, signal.getsignal(signum)))
+
+def _flush_and_chain(previous, signum, frame):
+    audit_log.flush()
+    if callable(previous):
+        previous(signum, frame)
+    elif previous != signal.SIG_IGN:
+        # Default disposition: re-deliver the signal so the process still terminates
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+def request_actor(request):
+    """
+    Identifies who made the request: the user id when authenticated, otherwise the client address.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return request.META.get('REMOTE_ADDR', '')
@@ -0,0 +1,98 @@
+from datetime import datetime, time, timedelta
+from django.db.models import Q, Count
+from django.utils import timezone
+from .analytics import OPENING_HOUR, WORKING_HOURS
+from .models import Rooms, RoomType, Bookings
+
+# Bit i of a room-day bitmap is the OPENING_HOUR + i slot
+FULL_DAY = (1 << WORKING_HOURS) - 1
+
+def _local_slot(day, bit):
+    return timezone.make_aware(datetime.combine(day, time(OPENING_HOUR + bit)))
+
+def _first_day_mask(after):
+    """
+    Bitmap of the slots on after's local day that start at or after it.
+    """
+    first_hour = after.hour + (1 if (after.minute, after.second, after.microsecond) != (0, 0, 0) else 0)
+    first_bit = min(max(first_hour - OPENING_HOUR, 0), WORKING_HOURS)
+    return FULL_DAY & ~((1 << first_bit) - 1)
+
+def load_occupancy(room_type, rooms, first_day, days):
+    """
+    Loads bookings for [first_day, first_day + days) in one query and returns
+    ({(room_id, date): occupied bitmap}, {(room_id, date): [seats used per hour]}).
+    Seat arrays are only filled for shared desks.
+    """
+    start = timezone.make_aware(datetime.combine(first_day, time.min))
+    end = timezone.make_aware(datetime.combine(first_day + timedelta(days=days), time.min))
+    bookings = Bookings.objects.filter(
+        room_id__in=[room.id for room in rooms], slot_start__gte=start, slot_start__lt=end
+    ).values('room_id', 'slot_start')
+    if room_type == RoomType.SHARED:
+        bookings = bookings.annotate(seats=Count('attendees', filter=~Q(attendees__user__age__lt=10)))
+
+    occupied, seats = {}, {}
+    for row in bookings:
+        local = timezone.localtime(row['slot_start'])
+        bit = local.hour - OPENING_HOUR
+        if not 0 <= bit < WORKING_HOURS:
+            continue
+        key = (row['room_id'], local.date())
+        occupied[key] = occupied.get(key, 0) | (1 << bit)
+        if room_type == RoomType.SHARED:
+            seats.setdefault(key, [0] * WORKING_HOURS)[bit] = row['seats']
+    return occupied, seats
+
+def _blocked_bitmap(room, key, attendees, occupied, seats):
+    """
+    Bitmap of the hours in which `room` cannot take `attendees` more people.
+    """
+    if room.room_type != RoomType.SHARED:
+        return occupied.get(key, 0)
+    used = seats.get(key)
+    if used is None:
+        return 0
+    blocked = 0
+    for bit, taken in enumerate(used):
+        if room.capacity - taken < attendees:
+            blocked |= 1 << bit
+    return blocked
+
+def next_available_slots(room_type, after, attendees=1, limit=5, days=14):
+    """
+    Returns up to `limit` of the earliest slots from `after` onwards, scanning at most `days`
+    local days, as [(slot_start, [(room, remaining_seats), ...]), ...].
+    """
+    rooms = [room for room in Rooms.objects.filter(room_type=room_type).order_by('id') if room.capacity >= attendees]
+    if not rooms:
+        return []
+    after = timezone.localtime(after)
+    first_day = after.date()
+    occupied, seats = load_occupancy(room_type, rooms, first_day, days)
+
+    results = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        allowed = _first_day_mask(after) if offset == 0 else FULL_DAY
+        free = {}
+        any_free = 0
+        for room in rooms:
+            room_free = allowed & ~_blocked_bitmap(room, (room.id, day), attendees, occupied, seats)
+            if room_free:
+                free[room.id] = room_free
+                any_free |= room_free
+
+        while any_free and len(results) < limit:
+            lowest = any_free & -any_free
+            bit = lowest.bit_length() - 1
+            slot_rooms = []
+            for room in rooms:
+                if free.get(room.id, 0) & lowest:
+                    used = seats.get((room.id, day), [0] * WORKING_HOURS)[bit]
+                    slot_rooms.append((room, room.capacity - used if room_type == RoomType.SHARED else room.capacity))
+            results.append((_local_slot(day, bit), slot_rooms))
+            any_free &= ~lowest
+        if len(results) >= limit:
+            break
+    return results
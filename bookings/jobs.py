@@ -0,0 +1,124 @@
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import Jobs, JobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_QUEUE = {
+    'WORKERS': 4,
+    'MODE': 'thread',
+    'BATCH_SIZE': 20,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 2.0,
+    'RETRY_BACKOFF_MAX': 600.0,
+    'STALE_AFTER': 300.0,
+}
+
+def job_queue_settings():
+    return {**DEFAULT_JOB_QUEUE, **getattr(settings, 'BOOKINGS_JOB_QUEUE', {})}
+
+def enqueue_on_commit(task: str, **payload):
+    """
+    Queues `task` (a dotted path to a callable) with JSON-serialisable keyword arguments.
+    The job row is written in the caller's transaction, so workers only see it once
+    that transaction commits and a rolled-back booking leaves no job behind.
+    """
+    return Jobs.objects.create(
+        task=task,
+        payload=payload,
+        max_attempts=job_queue_settings()['MAX_ATTEMPTS'],
+    )
+
+def claim_jobs(batch_size: int):
+    """
+    Claims up to batch_size due jobs for this caller and returns them.
+    The conditional UPDATE makes claiming safe across workers even where
+    SELECT ... FOR UPDATE SKIP LOCKED is unavailable (SQLite).
+    """
+    now = timezone.now()
+    worker_id = uuid.uuid4().hex
+    with transaction.atomic():
+        due_ids = list(Jobs.objects.select_for_update(skip_locked=True).filter(
+            status=JobStatus.PENDING, run_at__lte=now
+        ).order_by('run_at', 'id').values_list('id', flat=True)[:batch_size])
+        if not due_ids:
+            return []
+        Jobs.objects.filter(id__in=due_ids, status=JobStatus.PENDING).update(
+            status=JobStatus.RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+    return list(Jobs.objects.filter(locked_by=worker_id, status=JobStatus.RUNNING).order_by('run_at', 'id'))
+
+def requeue_stale_jobs(stale_after: float):
+    """
+    Returns jobs left running by a crashed worker to the queue. Jobs that have
+    already used every attempt (e.g. ones that keep killing their worker) are failed.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = Jobs.objects.filter(status=JobStatus.RUNNING, locked_at__lt=cutoff)
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=JobStatus.FAILED, locked_by='', locked_at=None,
+        last_error="Worker stopped while running the job on its final attempt.",
+    )
+    return stale.update(status=JobStatus.PENDING, locked_by='', locked_at=None)
+
+def execute_job(job_id: int, locked_by: str | None = None):
+    """
+    Runs one claimed job. Successful jobs are deleted; failures are retried with
+    exponential backoff until max_attempts, then left as failed.
+    Returns False without running anything if the job is no longer held by this claim
+    (e.g. it was requeued as stale and picked up by another worker).
+    """
+    try:
+        claimed = Jobs.objects.filter(id=job_id, status=JobStatus.RUNNING)
+        if locked_by is not None:
+            claimed = claimed.filter(locked_by=locked_by)
+        job = claimed.first()
+        if job is None:
+            logger.warning("Job %s is no longer claimed by this worker, skipping", job_id)
+            return False
+        try:
+            import_string(job.task)(**job.payload)
+        except Exception:
+            logger.exception("Job %s (%s) failed on attempt %s", job.id, job.task, job.attempts)
+            _record_failure(job, traceback.format_exc())
+            return False
+        job.delete()
+        return True
+    finally:
+        close_old_connections()
+
+def _record_failure(job: Jobs, error: str):
+    config = job_queue_settings()
+    if job.attempts >= job.max_attempts:
+        job.status = JobStatus.FAILED
+    else:
+        delay = min(config['RETRY_BACKOFF'] * 2 ** (job.attempts - 1), config['RETRY_BACKOFF_MAX'])
+        job.status = JobStatus.PENDING
+        job.run_at = timezone.now() + timedelta(seconds=delay)
+    job.locked_by = ''
+    job.locked_at = None
+    job.last_error = error
+    job.save(update_fields=['status', 'run_at', 'locked_by', 'locked_at', 'last_error'])
+
+def run_pending(batch_size: int | None = None):
+    """
+    Synchronously drains every due job in the current thread. Returns the number of jobs run.
+    """
+    batch_size = batch_size or job_queue_settings()['BATCH_SIZE']
+    processed = 0
+    while jobs := claim_jobs(batch_size):
+        for job in jobs:
+            execute_job(job.id, job.locked_by)
+        processed += len(jobs)
+    return processed
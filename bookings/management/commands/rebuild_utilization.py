@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from bookings.analytics import rebuild_utilization
+
+
+class Command(BaseCommand):
+    help = "Backfill or reconcile the utilization rollup table from bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help="First local date to rebuild (YYYY-MM-DD).")
+        parser.add_argument('--to', dest='date_to', help="Last local date to rebuild (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        dates = {}
+        for option in ('date_from', 'date_to'):
+            value = options[option]
+            if value:
+                try:
+                    dates[option] = parse_date(value)
+                except ValueError:
+                    dates[option] = None
+                if dates[option] is None:
+                    raise CommandError(f"Invalid date for --{option[5:]}: {value}")
+
+        written = rebuild_utilization(**dates)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} utilization rollup rows."))
@@ -0,0 +1,73 @@
+import logging
+import time
+import django
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.core.management.base import BaseCommand
+from django.db import connections
+from bookings.jobs import claim_jobs, execute_job, job_queue_settings, requeue_stale_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Run background job workers for the bookings job queue."
+
+    def add_arguments(self, parser):
+        config = job_queue_settings()
+        parser.add_argument('--workers', type=int, default=config['WORKERS'], help="Size of the worker pool.")
+        parser.add_argument('--mode', choices=['thread', 'process'], default=config['MODE'],
+                            help="Run jobs in a thread pool or a process pool.")
+        parser.add_argument('--batch-size', type=int, default=config['BATCH_SIZE'],
+                            help="Jobs claimed per dequeue.")
+        parser.add_argument('--poll-interval', type=float, default=config['POLL_INTERVAL'],
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is drained.")
+
+    def make_pool(self, options):
+        if options['mode'] == 'process':
+            # Spawn and forkserver children start without the app registry loaded.
+            # The initializer must be importable before setup, so it can't live in this module.
+            return ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup)
+        return ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='bookings-worker')
+
+    def handle(self, *args, **options):
+        stale_after = job_queue_settings()['STALE_AFTER']
+        process_mode = options['mode'] == 'process'
+        pool = self.make_pool(options)
+
+        self.stdout.write(f"Starting {options['workers']} {options['mode']} workers.")
+        processed = failed = 0
+        try:
+            while True:
+                try:
+                    requeue_stale_jobs(stale_after)
+                    jobs = claim_jobs(options['batch_size'])
+                    if not jobs:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+                    if process_mode:
+                        # Pools start children lazily on submit; under fork they must not
+                        # inherit the connection claim_jobs just used
+                        connections.close_all()
+                    results = list(pool.map(
+                        execute_job, [job.id for job in jobs], [job.locked_by for job in jobs]
+                    ))
+                    processed += len(results)
+                    failed += results.count(False)
+                except BrokenProcessPool:
+                    # Claimed jobs are picked up again by requeue_stale_jobs
+                    logger.exception("Worker process died, restarting the pool")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self.make_pool(options)
+                except Exception:
+                    logger.exception("Job worker loop failed, retrying")
+                    connections.close_all()
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping workers.")
+        finally:
+            pool.shutdown(wait=True)
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs ({failed} failed)."))
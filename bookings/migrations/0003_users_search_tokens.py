@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:40
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def tokenize_name(value):
+    # Frozen copy of bookings.models.tokenize_name as of this migration
+    normalized = unicodedata.normalize('NFKD', value or '')
+    normalized = ''.join(ch for ch in normalized if not unicodedata.combining(ch)).casefold()
+    return [token for token in re.split(r'\W+', normalized) if token]
+
+
+def backfill_name_tokens(apps, schema_editor):
+    User = apps.get_model('bookings', 'Users')
+    UserNameToken = apps.get_model('bookings', 'UserNameTokens')
+    tokens = []
+    for user_id, name in User.objects.values_list('id', 'name').iterator():
+        tokens.extend(UserNameToken(user_id=user_id, token=token) for token in set(tokenize_name(name)))
+    UserNameToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_seed_rooms'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='users',
+            name='name',
+            field=models.CharField(db_index=True, max_length=120),
+        ),
+        migrations.CreateModel(
+            name='UserNameTokens',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=120)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_tokens', to='bookings.users')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'user'], name='user_token_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'token'), name='unique_user_token')],
+            },
+        ),
+        migrations.RunPython(backfill_name_tokens, migrations.RunPython.noop),
+    ]
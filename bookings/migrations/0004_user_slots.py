@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_user_slots(apps, schema_editor):
+    BookingAttendee = apps.get_model('bookings', 'BookingAttendees')
+    UserSlot = apps.get_model('bookings', 'UserSlots')
+    slots = [
+        UserSlot(attendee_id=attendee_id, booking_id=booking_id, user_id=user_id, slot_start=slot_start)
+        for attendee_id, booking_id, user_id, slot_start in BookingAttendee.objects.values_list(
+            'id', 'booking_id', 'user_id', 'booking__slot_start'
+        ).iterator()
+    ]
+    UserSlot.objects.bulk_create(slots, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_users_search_tokens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSlots',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot_start', models.DateTimeField()),
+                ('attendee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='user_slot', to='bookings.bookingattendees')),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_slots', to='bookings.bookings')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='bookings.users')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'slot_start'), name='unique_user_slot')],
+            },
+        ),
+        migrations.RunPython(backfill_user_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_user_slots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UtilizationRollups',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hour', models.PositiveSmallIntegerField()),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('headcount', models.PositiveIntegerField(default=0)),
+                ('seats', models.PositiveIntegerField(default=0)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization', to='bookings.rooms')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'hour', 'room'), name='unique_rollup_cell')],
+            },
+        ),
+    ]
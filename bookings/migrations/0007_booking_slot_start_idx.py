@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_jobs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['slot_start'], name='booking_slot_start_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_booking_slot_start_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvents',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('actor', models.CharField(blank=True, max_length=64)),
+                ('action', models.CharField(max_length=16)),
+                ('result', models.CharField(max_length=16)),
+                ('booking_code', models.CharField(blank=True, db_index=True, max_length=20)),
+                ('room', models.CharField(blank=True, max_length=10)),
+                ('slot_start', models.DateTimeField(blank=True, null=True)),
+                ('user_ids', models.JSONField(default=list)),
+                ('team_id', models.BigIntegerField(blank=True, null=True)),
+                ('detail', models.TextField(blank=True)),
+            ],
+        ),
+    ]
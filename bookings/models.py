@@ -1,6 +1,19 @@
-from django.db import models
+import re
+import unicodedata
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.utils import timezone
 
+
+def tokenize_name(value):
+    """
+    Splits a name into case- and accent-insensitive search tokens.
+    """
+    normalized = unicodedata.normalize('NFKD', value or '')
+    normalized = ''.join(ch for ch in normalized if not unicodedata.combining(ch)).casefold()
+    return [token for token in re.split(r'\W+', normalized) if token]
+
+
 # Create your models here.
 class Gender(models.TextChoices):
     MALE = 'M', 'Male'
@@ -8,12 +21,42 @@ class Gender(models.TextChoices):
     OTHER = 'O', 'Other'
 
 class Users(models.Model):
-    name = models.CharField(max_length=120)
+    name = models.CharField(max_length=120, db_index=True)
     age = models.PositiveIntegerField()
     gender = models.CharField(max_length=1, choices=Gender.choices)
 
     def __str__(self):
         return f'{self.name} ({self.age})'
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.sync_name_tokens()
+
+    def sync_name_tokens(self):
+        """
+        Keeps the UserNameTokens search index in step with the current name.
+        Only save() calls this: Users.objects.bulk_create() and .update(name=...)
+        bypass it, so call sync_name_tokens() on the affected users afterwards.
+        """
+        tokens = set(tokenize_name(self.name))
+        self.name_tokens.exclude(token__in=tokens).delete()
+        existing = set(self.name_tokens.values_list('token', flat=True))
+        UserNameTokens.objects.bulk_create(
+            [UserNameTokens(user=self, token=token) for token in tokens - existing]
+        )
+
+class UserNameTokens(models.Model):
+    user = models.ForeignKey(Users, on_delete=models.CASCADE, related_name='name_tokens')
+    token = models.CharField(max_length=120)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'token'], name='unique_user_token')
+        ]
+        indexes = [
+            models.Index(fields=['token', 'user'], name='user_token_idx')
+        ]
     
 class Teams(models.Model):
     name = models.CharField(max_length=120)
@@ -54,6 +97,9 @@ class Bookings(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['room', 'slot_start'], name='unique_room_slot')
         ]
+        indexes = [
+            models.Index(fields=['slot_start'], name='booking_slot_start_idx')
+        ]
 
     def __str__(self):
         return f'Booking {self.booking_code} for Room {self.room.room_number} @ {self.slot_start:%Y-%m-%d %H:%M}'    
@@ -68,4 +114,96 @@ class BookingAttendees(models.Model):
         ]
 
     def __str__(self):
-        return f'Attendee {self.user.name} for Booking {self.booking}'
\ No newline at end of file
+        return f'Attendee {self.user.name} for Booking {self.booking}'
+
+class UserSlots(models.Model):
+    """
+    Denormalised (user, slot_start) index over BookingAttendees.
+    One row per attendee; removed with the attendee or booking by cascade.
+    """
+    attendee = models.OneToOneField(BookingAttendees, on_delete=models.CASCADE, related_name='user_slot')
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='user_slots')
+    user = models.ForeignKey(Users, on_delete=models.CASCADE, related_name='slots')
+    slot_start = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'slot_start'], name='unique_user_slot')
+        ]
+
+    def __str__(self):
+        return f'User {self.user_id} @ {self.slot_start:%Y-%m-%d %H:%M}'
+
+class UtilizationRollups(models.Model):
+    """
+    Per room, per local date and hour booking totals.
+    Maintained by background jobs queued from book_slot/cancel_booking; rebuilt by `manage.py rebuild_utilization`.
+    """
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+    room = models.ForeignKey(Rooms, on_delete=models.CASCADE, related_name='utilization')
+    bookings = models.PositiveIntegerField(default=0)
+    headcount = models.PositiveIntegerField(default=0)
+    seats = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'hour', 'room'], name='unique_rollup_cell')
+        ]
+
+    def __str__(self):
+        return f'Room {self.room_id} @ {self.date} {self.hour:02d}:00'
+
+class JobStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    RUNNING = 'running', 'Running'
+    FAILED = 'failed', 'Failed'
+
+class Jobs(models.Model):
+    """
+    Background job queued by bookings.jobs; successful jobs are deleted, failed ones kept for inspection.
+    """
+    task = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=8, choices=JobStatus.choices, default=JobStatus.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=32, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx')
+        ]
+
+    def __str__(self):
+        return f'Job {self.id} {self.task} ({self.status})'
+
+class AuditEvents(models.Model):
+    """
+    Append-only trail of booking and cancellation attempts, written in batches by bookings.audit.
+    """
+    created_at = models.DateTimeField(db_index=True)
+    actor = models.CharField(max_length=64, blank=True)
+    action = models.CharField(max_length=16)
+    result = models.CharField(max_length=16)
+    booking_code = models.CharField(max_length=20, blank=True, db_index=True)
+    room = models.CharField(max_length=10, blank=True)
+    slot_start = models.DateTimeField(null=True, blank=True)
+    user_ids = models.JSONField(default=list)
+    team_id = models.BigIntegerField(null=True, blank=True)
+    detail = models.TextField(blank=True)
+
+    def __str__(self):
+        return f'{self.created_at:%Y-%m-%d %H:%M:%S} {self.action} {self.booking_code} ({self.result})'
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Audit events are append-only.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Audit events are append-only.")
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Users, Teams, Rooms, Bookings, BookingAttendees, RoomType
+from .analytics import OPENING_HOUR, CLOSING_HOUR
+from .models import Users, Teams, Rooms, Bookings, BookingAttendees, RoomType, UserSlots, AuditEvents
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -31,6 +32,21 @@ class BookingSerializer(serializers.ModelSerializer):
         model = Bookings
         fields = ['id', 'room', 'slot_start', 'slot_end', 'booking_code', 'attendees']
 
+class UserScheduleSerializer(serializers.ModelSerializer):
+    booking_code = serializers.CharField(source='booking.booking_code')
+    room = serializers.StringRelatedField(source='booking.room')
+    slot_end = serializers.DateTimeField(source='booking.slot_end')
+
+    class Meta:
+        model = UserSlots
+        fields = ['booking_code', 'room', 'slot_start', 'slot_end']
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditEvents
+        fields = ['id', 'created_at', 'actor', 'action', 'result', 'booking_code', 'room',
+                  'slot_start', 'user_ids', 'team_id', 'detail']
+
 class CreateBookingSerializer(serializers.Serializer):
     slot = serializers.DateTimeField()
     room_type = serializers.ChoiceField(choices=RoomType.choices)
@@ -41,7 +57,22 @@ class CreateBookingSerializer(serializers.Serializer):
         slot = data.get('slot')
         if slot.minute != 0 or slot.second != 0:
             raise serializers.ValidationError("Slot must be on the hour (e.g., 10:00, 14:00).")
-        if not (9 <= slot.hour < 18):
+        if not (OPENING_HOUR <= slot.hour < CLOSING_HOUR):
             raise serializers.ValidationError("Slot must be within working hours (9 AM to 6 PM).")
         return data
     
+class BulkCancelBookingSerializer(serializers.Serializer):
+    booking_codes = serializers.ListField(child=serializers.CharField(max_length=20), required=False, allow_empty=False)
+    team_id = serializers.PrimaryKeyRelatedField(queryset=Teams.objects.all(), required=False)
+    user_id = serializers.PrimaryKeyRelatedField(queryset=Users.objects.all(), required=False)
+    room_id = serializers.PrimaryKeyRelatedField(queryset=Rooms.objects.all(), required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError("At least one filter is required.")
+        date_from, date_to = data.get('date_from'), data.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError("date_from must be on or before date_to.")
+        return data
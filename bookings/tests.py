@@ -1,11 +1,18 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from .models import Users, Teams, Rooms, Bookings, BookingAttendees, RoomType
-from datetime import datetime
+from datetime import datetime, timedelta
+from io import StringIO
 
 
+# Write audit events through synchronously so they land inside each test's transaction
+@override_settings(BOOKINGS_AUDIT={'BATCH_SIZE': 1, 'FLUSH_INTERVAL': None})
 class BaseTestSetup(TestCase):
     def setUp(self):
+        # Throttle buckets live in the cache and must not leak between tests
+        cache.clear()
+
         # Create test users
         self.user1 = Users.objects.create(name="User One", age=25, gender='M')
         self.user2 = Users.objects.create(name="User Two", age=30, gender='F') 
@@ -169,3 +176,628 @@ class CancellationTests(BaseTestSetup):
         self.assertTrue(Bookings.objects.filter(booking_code=booking.booking_code).exists())
 
 
+class BulkCancellationTests(BaseTestSetup):
+    def test_bulk_cancel_by_date_range(self):
+        """Test bulk cancellation removes every booking on the day"""
+        from .utils import book_slot, cancel_bookings_bulk
+
+        private = book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        shared = book_slot(slot_start=self.test_slot, room_type=RoomType.SHARED, users=[self.user2])
+
+        summary = cancel_bookings_bulk(
+            booking_codes=[private.booking_code, 'missing'],
+            date_from=self.test_slot.date(),
+            date_to=self.test_slot.date(),
+        )
+
+        self.assertEqual(summary['results'][private.booking_code], 'cancelled')
+        self.assertEqual(summary['results']['missing'], 'not_found')
+        self.assertEqual(summary['bookings_cancelled'], 1)
+        self.assertTrue(Bookings.objects.filter(id=shared.id).exists())
+
+    def test_bulk_cancel_user_from_shared_desk(self):
+        """Test bulk cancellation by user keeps shared desks with other attendees"""
+        from .utils import book_slot, cancel_bookings_bulk
+
+        shared = book_slot(slot_start=self.test_slot, room_type=RoomType.SHARED, users=[self.user1])
+        book_slot(slot_start=self.test_slot, room_type=RoomType.SHARED, users=[self.user2])
+        later = book_slot(slot_start=self.test_slot + timedelta(hours=1), room_type=RoomType.PRIVATE, users=[self.user1])
+
+        summary = cancel_bookings_bulk(user=self.user1)
+
+        self.assertEqual(summary['results'][shared.booking_code], 'user_removed')
+        self.assertEqual(summary['results'][later.booking_code], 'cancelled')
+        self.assertEqual(summary['attendees_removed'], 2)
+        self.assertEqual(list(shared.attendees.values_list('user_id', flat=True)), [self.user2.id])
+        self.assertFalse(Bookings.objects.filter(id=later.id).exists())
+
+    def test_bulk_cancel_user_keeps_conference_minimum(self):
+        """Test bulk cancellation by user cancels conference bookings left below the minimum"""
+        from .utils import book_slot, cancel_bookings_bulk
+
+        user4 = Users.objects.create(name="User Four", age=40, gender='F')
+        small = book_slot(slot_start=self.test_slot, room_type=RoomType.CONFERENCE, team=self.team)
+        large = book_slot(
+            slot_start=self.test_slot + timedelta(hours=1), room_type=RoomType.CONFERENCE,
+            users=[self.user1, self.user2, self.user3, user4],
+        )
+
+        summary = cancel_bookings_bulk(user=self.user1)
+
+        self.assertEqual(summary['results'], {small.booking_code: 'cancelled', large.booking_code: 'user_removed'})
+        self.assertEqual(summary['bookings_cancelled'], 1)
+        self.assertEqual(summary['attendees_removed'], 4)
+        self.assertFalse(Bookings.objects.filter(id=small.id).exists())
+        self.assertFalse(BookingAttendees.objects.filter(booking_id=small.id).exists())
+        self.assertEqual(large.attendees.count(), 3)
+
+    def test_bulk_cancel_reports_codes_excluded_by_filters(self):
+        """Test existing codes excluded by other filters are reported as not matched"""
+        from .utils import book_slot, cancel_bookings_bulk
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+
+        summary = cancel_bookings_bulk(booking_codes=[booking.booking_code, 'missing'], team=self.team)
+
+        self.assertEqual(summary['results'], {booking.booking_code: 'not_matched', 'missing': 'not_found'})
+        self.assertTrue(Bookings.objects.filter(id=booking.id).exists())
+
+    def test_bulk_cancel_endpoint_requires_filter(self):
+        """Test bulk cancellation endpoint rejects an empty filter set"""
+        response = self.client.post('/api/v1/bookings/cancel-bulk/', {}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+
+class UserSearchTests(BaseTestSetup):
+    def test_search_matches_token_prefixes(self):
+        """Test search is case-insensitive and matches any name token prefix"""
+        from .utils import search_users
+
+        jose = Users.objects.create(name="José Álvarez", age=40, gender='M')
+
+        self.assertEqual(list(search_users("us thr")), [self.user3])
+        self.assertEqual(list(search_users("ALV jos")), [jose])
+        self.assertEqual(search_users("user").count(), 4)
+
+    def test_search_tracks_renames(self):
+        """Test the name token index is kept in sync on save"""
+        from .utils import search_users
+
+        self.user1.name = "Renamed Person"
+        self.user1.save()
+
+        self.assertNotIn(self.user1, search_users("one"))
+        self.assertIn(self.user1, search_users("renamed"))
+
+    def test_search_endpoint_batch_ids(self):
+        """Test batch id lookup through the search endpoint"""
+        response = self.client.get(f'/api/v1/users/search/?ids={self.user2.id},{self.user1.id}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([user['id'] for user in response.json()['results']], [self.user1.id, self.user2.id])
+
+class UserScheduleTests(BaseTestSetup):
+    def test_schedule_index_follows_booking_and_cancellation(self):
+        """Test the user slot index is maintained by booking and cancellation"""
+        from .models import UserSlots
+        from .utils import book_slot, cancel_booking
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.CONFERENCE, team=self.team)
+        self.assertEqual(UserSlots.objects.filter(booking=booking).count(), 3)
+
+        cancel_booking(booking.booking_code, user=self.user1)
+        self.assertFalse(UserSlots.objects.filter(user=self.user1).exists())
+
+        cancel_booking(booking.booking_code)
+        self.assertFalse(UserSlots.objects.exists())
+
+    def test_double_booking_rejected_across_room_types(self):
+        """Test a user cannot hold two bookings in the same slot"""
+        from .utils import book_slot, BookingError
+
+        book_slot(slot_start=self.test_slot, room_type=RoomType.SHARED, users=[self.user1])
+
+        with self.assertRaises(BookingError):
+            book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+
+    def test_schedule_endpoint(self):
+        """Test schedule endpoint returns bookings within the range"""
+        from .utils import book_slot
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        book_slot(slot_start=self.test_slot + timedelta(days=8), room_type=RoomType.PRIVATE, users=[self.user1])
+
+        day = self.test_slot.date()
+        response = self.client.get(
+            f'/api/v1/users/{self.user1.id}/schedule/?from={day}&to={day + timedelta(days=7)}'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([b['booking_code'] for b in response.json()['bookings']], [booking.booking_code])
+
+    def test_schedule_date_range_is_inclusive_and_validated(self):
+        """Test a date-only to covers that day and impossible dates are rejected"""
+        from .utils import book_slot
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        day = self.test_slot.date()
+        url = f'/api/v1/users/{self.user1.id}/schedule/'
+
+        response = self.client.get(url, {'from': day, 'to': day})
+        self.assertEqual([b['booking_code'] for b in response.json()['bookings']], [booking.booking_code])
+        self.assertEqual(self.client.get(url, {'from': '2025-02-30'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'from': '2025-10-14T25:00:00'}).status_code, 400)
+
+class UtilizationTests(BaseTestSetup):
+    def test_rollup_maintained_by_jobs(self):
+        """Test rollups follow booking and cancellation once queued jobs run"""
+        from .jobs import run_pending
+        from .models import UtilizationRollups
+        from .utils import book_slot, cancel_booking
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.SHARED, users=[self.user1])
+        run_pending()
+        book_slot(slot_start=self.test_slot, room_type=RoomType.SHARED, users=[self.child_user])
+        run_pending()
+
+        rollup = UtilizationRollups.objects.get(room=booking.room, date=self.test_slot.date(), hour=10)
+        self.assertEqual((rollup.bookings, rollup.headcount, rollup.seats), (1, 2, 1))
+
+        cancel_booking(booking.booking_code)
+        run_pending()
+        rollup.refresh_from_db()
+        self.assertEqual((rollup.bookings, rollup.headcount, rollup.seats), (0, 0, 0))
+
+    def test_rebuild_matches_incremental(self):
+        """Test rebuild command reproduces the incrementally maintained rollups"""
+        from django.core.management import call_command
+        from .jobs import run_pending
+        from .models import UtilizationRollups
+        from .utils import book_slot
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.CONFERENCE, team=self.team)
+        run_pending()
+        UtilizationRollups.objects.all().delete()
+
+        call_command('rebuild_utilization', stdout=StringIO())
+
+        rollup = UtilizationRollups.objects.get(room=booking.room)
+        self.assertEqual((rollup.bookings, rollup.headcount, rollup.seats), (1, 3, 3))
+
+    def test_rebuild_date_range_and_invalid_dates(self):
+        """Test rebuild limits itself to the given days and rejects impossible dates"""
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from .models import UtilizationRollups
+        from .utils import book_slot
+
+        book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        book_slot(slot_start=self.test_slot + timedelta(days=1), room_type=RoomType.PRIVATE, users=[self.user1])
+        day = self.test_slot.date()
+
+        call_command('rebuild_utilization', '--from', str(day), '--to', str(day), stdout=StringIO())
+
+        self.assertEqual(list(UtilizationRollups.objects.values_list('date', flat=True)), [day])
+        with self.assertRaises(CommandError):
+            call_command('rebuild_utilization', '--from', '2025-02-30', stdout=StringIO())
+
+    def test_utilization_endpoint_rejects_impossible_dates(self):
+        """Test analytics endpoint returns 400 for well-formed but invalid dates"""
+        response = self.client.get('/api/v1/analytics/utilization/?from=2025-02-30&to=2025-03-01')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_utilization_endpoint_by_room_type(self):
+        """Test analytics endpoint reports occupancy per room type"""
+        from .jobs import run_pending
+        from .utils import book_slot
+
+        book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        run_pending()
+
+        day = self.test_slot.date()
+        response = self.client.get(f'/api/v1/analytics/utilization/?from={day}&to={day}&group_by=room_type')
+
+        self.assertEqual(response.status_code, 200)
+        results = {row['room_type']: row for row in response.json()['results']}
+        self.assertEqual(results[RoomType.PRIVATE]['bookings'], 1)
+        private_rooms = Rooms.objects.filter(room_type=RoomType.PRIVATE).count()
+        self.assertEqual(results[RoomType.PRIVATE]['occupancy_rate'], round(1 / (private_rooms * 9), 4))
+
+
+def failing_job(**kwargs):
+    raise RuntimeError("boom")
+
+
+class JobQueueTests(BaseTestSetup):
+    def test_booking_enqueues_job_in_transaction(self):
+        """Test booking queues its side effects instead of running them inline"""
+        from .models import Jobs, UtilizationRollups
+        from .utils import book_slot
+
+        book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+
+        self.assertEqual(Jobs.objects.count(), 1)
+        self.assertFalse(UtilizationRollups.objects.exists())
+
+    def test_failed_job_retries_with_backoff(self):
+        """Test failed jobs are rescheduled and eventually marked failed"""
+        from .jobs import enqueue_on_commit, run_pending
+        from .models import Jobs, JobStatus
+
+        job = enqueue_on_commit('bookings.tests.failing_job', value=1)
+        job.max_attempts = 2
+        job.save()
+
+        with self.assertLogs('bookings.jobs', 'ERROR'):
+            self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (JobStatus.PENDING, 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("boom", job.last_error)
+
+        Jobs.objects.filter(id=job.id).update(run_at=timezone.now())
+        with self.assertLogs('bookings.jobs', 'ERROR'):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (JobStatus.FAILED, 2))
+
+    def test_stale_jobs_requeued_or_failed(self):
+        """Test stale running jobs are requeued unless their attempts are used up"""
+        from datetime import timedelta as delta
+        from .jobs import claim_jobs, enqueue_on_commit, execute_job, requeue_stale_jobs
+        from .models import Jobs, JobStatus
+
+        retry = enqueue_on_commit('bookings.tests.failing_job')
+        final = enqueue_on_commit('bookings.tests.failing_job')
+        Jobs.objects.filter(id=final.id).update(max_attempts=1)
+        claimed = {job.id: job.locked_by for job in claim_jobs(2)}
+        Jobs.objects.update(locked_at=timezone.now() - delta(hours=1))
+
+        requeue_stale_jobs(60)
+
+        self.assertEqual(Jobs.objects.get(id=retry.id).status, JobStatus.PENDING)
+        self.assertEqual(Jobs.objects.get(id=final.id).status, JobStatus.FAILED)
+        with self.assertLogs('bookings.jobs', 'WARNING'):
+            self.assertFalse(execute_job(retry.id, claimed[retry.id]))
+
+    def test_claim_jobs_in_batches(self):
+        """Test dequeue claims at most one batch and never the same job twice"""
+        from .jobs import enqueue_on_commit, claim_jobs
+
+        for _ in range(5):
+            enqueue_on_commit('bookings.tests.failing_job')
+
+        first = claim_jobs(3)
+        second = claim_jobs(3)
+
+        self.assertEqual((len(first), len(second)), (3, 2))
+        self.assertFalse({job.id for job in first} & {job.id for job in second})
+
+
+class AdminTests(BaseTestSetup):
+    def changelist_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelists_do_not_query_per_row(self):
+        """Test booking and attendee changelists use a constant number of queries"""
+        from django.contrib.auth.models import User
+        from .utils import book_slot
+
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        baseline = [self.changelist_queries(f'/admin/bookings/{model}/') for model in ('bookings', 'bookingattendees')]
+
+        for hour in range(11, 16):
+            book_slot(slot_start=self.test_slot.replace(hour=hour), room_type=RoomType.CONFERENCE, team=self.team)
+
+        for model, queries in zip(('bookings', 'bookingattendees'), baseline):
+            self.assertEqual(self.changelist_queries(f'/admin/bookings/{model}/'), queries)
+
+    def test_user_autocomplete_uses_name_tokens_without_counting(self):
+        """Test the users autocomplete matches name tokens and never counts the result"""
+        from django.contrib.auth.models import User
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        Users.objects.bulk_create([Users(name=f"Bulk {n:02}", age=20, gender='M') for n in range(25)])
+        for user in Users.objects.filter(name__startswith="Bulk"):
+            user.save()  # bulk_create skips the name token sync
+        url = '/admin/autocomplete/?app_label=bookings&model_name=teams&field_name=members&term='
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url + 'two')
+        self.assertEqual([row['text'] for row in response.json()['results']], ["User Two (30)"])
+        self.assertFalse(response.json()['pagination']['more'])
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+
+        first = self.client.get(url + 'bulk').json()
+        last = self.client.get(url + 'bulk&page=2').json()
+        self.assertEqual((len(first['results']), first['pagination']['more']), (20, True))
+        self.assertEqual((len(last['results']), last['pagination']['more']), (5, False))
+        self.assertEqual(self.client.get(url + 'bulk&page=3').status_code, 404)
+
+    def test_admin_cannot_bypass_booking_rules(self):
+        """Test attendees are read-only in admin and booking deletes go through cancel_booking"""
+        from django.contrib.auth.models import User
+        from .models import Jobs, UserSlots
+        from .utils import book_slot
+
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        attendee = booking.attendees.get()
+
+        self.assertEqual(self.client.get('/admin/bookings/bookingattendees/add/').status_code, 403)
+        self.assertEqual(self.client.get('/admin/bookings/bookings/add/').status_code, 403)
+        self.assertEqual(self.client.get(f'/admin/bookings/bookingattendees/{attendee.id}/delete/').status_code, 403)
+
+        jobs_before = Jobs.objects.count()
+        response = self.client.post(f'/admin/bookings/bookings/{booking.id}/delete/', {'post': 'yes'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Bookings.objects.filter(id=booking.id).exists())
+        self.assertFalse(UserSlots.objects.exists())
+        self.assertEqual(Jobs.objects.count(), jobs_before + 1)
+
+
+class AdmissionControlTests(BaseTestSetup):
+    def test_gate_rejects_when_queue_full(self):
+        """Test the gate rejects immediately once concurrency and queue are exhausted"""
+        from .throttling import AdmissionGate, Overloaded
+
+        gate = AdmissionGate(max_concurrent=1, max_queue=0, queue_timeout=1.0, retry_after=2)
+        with gate.admit():
+            with self.assertRaises(Overloaded) as context:
+                with gate.admit():
+                    pass
+
+        self.assertEqual(context.exception.wait, 2)
+        metrics = gate.metrics()
+        self.assertEqual((metrics['admitted'], metrics['rejected_queue_full'], metrics['in_flight']), (1, 1, 0))
+
+    def test_gate_times_out_queued_request(self):
+        """Test a queued request is rejected after the queue timeout"""
+        from .throttling import AdmissionGate, Overloaded
+
+        gate = AdmissionGate(max_concurrent=1, max_queue=1, queue_timeout=0.01, retry_after=1)
+        with gate.admit():
+            with self.assertRaises(Overloaded):
+                with gate.admit():
+                    pass
+
+        self.assertEqual(gate.metrics()['rejected_timeout'], 1)
+
+    def test_token_bucket_throttle(self):
+        """Test token bucket allows a burst, then throttles with a retry hint"""
+        from rest_framework.test import APIRequestFactory
+        from .throttling import TokenBucketThrottle
+
+        class TwoPerMinute(TokenBucketThrottle):
+            scope = 'test'
+            rate = '2/min'
+
+        request = APIRequestFactory().get('/')
+        request.user = None
+        throttle = TwoPerMinute()
+
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertFalse(throttle.allow_request(request, None))
+        self.assertAlmostEqual(throttle.wait(), 30, delta=1)
+
+    def test_token_bucket_concurrent_requests(self):
+        """Test concurrent requests from one client cannot spend the same token"""
+        from concurrent.futures import ThreadPoolExecutor
+        from rest_framework.test import APIRequestFactory
+        from .throttling import TokenBucketThrottle
+
+        class FivePerMinute(TokenBucketThrottle):
+            scope = 'test_concurrent'
+            rate = '5/min'
+
+        request = APIRequestFactory().get('/')
+        request.user = None
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            allowed = list(pool.map(lambda _: FivePerMinute().allow_request(request, None), range(20)))
+
+        self.assertEqual(allowed.count(True), 5)
+
+    def test_overloaded_response_has_retry_after(self):
+        """Test a full gate turns booking writes into 503 with Retry-After"""
+        from unittest import mock
+        from .throttling import AdmissionGate
+
+        gate = AdmissionGate(max_concurrent=1, max_queue=0, queue_timeout=0, retry_after=3)
+        with mock.patch('bookings.views.booking_gate', gate), gate.admit():
+            response = self.client.post(
+                '/api/v1/bookings/cancel/', {'booking_code': 'missing'}, content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertIn('admitted', self.client.get('/api/v1/metrics/admission/').json())
+
+
+class NextAvailableTests(BaseTestSetup):
+    def test_skips_fully_booked_slots(self):
+        """Test search moves to the next hour once every private room is taken"""
+        from .availability import next_available_slots
+
+        for room in Rooms.objects.filter(room_type=RoomType.PRIVATE):
+            Bookings.objects.create(room=room, slot_start=self.test_slot, slot_end=self.test_slot + timedelta(hours=1),
+                                    booking_code=f'full-{room.id}')
+
+        slots = next_available_slots(RoomType.PRIVATE, self.test_slot, limit=2)
+
+        self.assertEqual([slot for slot, _ in slots], [self.test_slot + timedelta(hours=1), self.test_slot + timedelta(hours=2)])
+
+    def test_rolls_over_to_next_day(self):
+        """Test search after closing time starts at opening on the next day"""
+        from .availability import next_available_slots
+
+        slots = next_available_slots(RoomType.CONFERENCE, self.test_slot.replace(hour=17, minute=30), limit=1)
+
+        self.assertEqual(slots[0][0], self.test_slot.replace(hour=9) + timedelta(days=1))
+
+    def test_shared_desk_seat_arrays(self):
+        """Test shared desks are skipped when remaining seats cannot fit the attendees"""
+        from .availability import next_available_slots
+        from .utils import book_slot
+
+        for user in (self.user1, self.user2, self.user3):
+            book_slot(slot_start=self.test_slot, room_type=RoomType.SHARED, users=[user])
+        desk = Bookings.objects.get(slot_start=self.test_slot).room
+
+        slot, rooms = next_available_slots(RoomType.SHARED, self.test_slot, attendees=2, limit=1)[0]
+        self.assertEqual(slot, self.test_slot)
+        self.assertNotIn(desk.id, [room.id for room, _ in rooms])
+
+        slot, rooms = next_available_slots(RoomType.SHARED, self.test_slot, attendees=1, limit=1)[0]
+        self.assertIn((desk.id, 1), [(room.id, remaining) for room, remaining in rooms])
+
+    def test_next_available_endpoint(self):
+        """Test next available endpoint validates room_type and returns slots"""
+        self.assertEqual(self.client.get('/api/v1/rooms/next-available/').status_code, 400)
+
+        response = self.client.get(
+            '/api/v1/rooms/next-available/', {'room_type': RoomType.PRIVATE, 'after': self.test_slot.isoformat()}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_next_available_endpoint_applies_booking_rules(self):
+        """Test attendees must satisfy the same room type rules as book_slot"""
+        url = '/api/v1/rooms/next-available/'
+
+        self.assertEqual(self.client.get(url, {'room_type': RoomType.CONFERENCE, 'attendees': 1}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'room_type': RoomType.PRIVATE, 'attendees': 2}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'room_type': RoomType.SHARED, 'attendees': 2}).status_code, 400)
+
+        response = self.client.get(url, {'room_type': RoomType.CONFERENCE})
+        self.assertEqual((response.status_code, response.json()['attendees']), (200, 3))
+
+
+class AuditLogTests(BaseTestSetup):
+    def test_events_buffered_until_batch_is_full(self):
+        """Test audit events are written in batches rather than one row per event"""
+        from .audit import AuditLog
+        from .models import AuditEvents
+
+        log = AuditLog()
+        with self.settings(BOOKINGS_AUDIT={'BATCH_SIZE': 3, 'FLUSH_INTERVAL': None}):
+            log.record('book', 'success', booking_code='a')
+            log.record('book', 'success', booking_code='b')
+            self.assertEqual((AuditEvents.objects.count(), log.pending()), (0, 2))
+
+            log.record('cancel', 'success', booking_code='a')
+            self.assertEqual((AuditEvents.objects.count(), log.pending()), (3, 0))
+
+            log.record('book', 'rejected')
+            self.assertEqual(log.flush(), 1)
+
+    def test_buffer_is_bounded_when_flush_fails(self):
+        """Test failed flushes requeue events without growing past MAX_BUFFER"""
+        from unittest import mock
+        from .audit import AuditLog
+
+        log = AuditLog()
+        with self.settings(BOOKINGS_AUDIT={'BATCH_SIZE': 10, 'FLUSH_INTERVAL': None, 'MAX_BUFFER': 3}):
+            for code in 'abcd':
+                log.record('book', 'success', booking_code=code)
+            self.assertEqual((log.pending(), log.dropped), (3, 1))
+
+            with mock.patch('bookings.audit.AuditEvents.objects.bulk_create', side_effect=RuntimeError), \
+                    self.assertLogs('bookings.audit', 'ERROR'):
+                self.assertEqual(log.flush(), 0)
+            log.record('book', 'success', booking_code='e')
+
+            self.assertEqual(log.pending(), 3)
+            self.assertEqual([event.booking_code for event in log._events], ['c', 'd', 'e'])
+            # Don't leave events for the exit flush once the test database is gone
+            log._events.clear()
+
+    def test_buffer_flushed_on_exit_and_signals(self):
+        """Test the exit flush is always registered and signals flush before the previous handler runs"""
+        import os
+        import signal
+        from unittest import mock
+        from .audit import AuditLog, install_signal_handlers
+        from .models import AuditEvents
+
+        with mock.patch('bookings.audit.atexit.register') as register:
+            log = AuditLog()
+        register.assert_called_once_with(log.flush)
+
+        received = []
+        original = signal.signal(signal.SIGUSR1, lambda signum, frame: received.append(signum))
+        self.addCleanup(signal.signal, signal.SIGUSR1, original)
+        with mock.patch('bookings.audit.audit_log', log), \
+                self.settings(BOOKINGS_AUDIT={'BATCH_SIZE': 10, 'FLUSH_INTERVAL': None}):
+            install_signal_handlers(signals=(signal.SIGUSR1,))
+            log.record('book', 'success', booking_code='a')
+            os.kill(os.getpid(), signal.SIGUSR1)
+
+        self.assertEqual(received, [signal.SIGUSR1])
+        self.assertEqual((AuditEvents.objects.count(), log.pending()), (1, 0))
+
+    def test_events_are_append_only(self):
+        """Test stored audit events cannot be modified or deleted"""
+        from .models import AuditEvents
+
+        event = AuditEvents.objects.create(created_at=timezone.now(), action='book', result='success')
+
+        with self.assertRaises(ValueError):
+            event.save()
+        with self.assertRaises(ValueError):
+            event.delete()
+
+    def test_audit_endpoint_filters_booking_trail(self):
+        """Test booking and cancellation are audited and queryable by time range and action"""
+        from .utils import book_slot
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        start = timezone.now()
+        self.client.post('/api/v1/bookings/cancel/', {'booking_code': booking.booking_code}, content_type='application/json')
+        self.client.post('/api/v1/bookings/cancel/', {'booking_code': booking.booking_code}, content_type='application/json')
+
+        response = self.client.get('/api/v1/audit/', {'from': start.isoformat(), 'action': 'cancel'})
+
+        self.assertEqual(response.status_code, 200)
+        events = response.json()['results']
+        self.assertEqual([event['result'] for event in events], ['rejected', 'success'])
+        self.assertEqual(events[1]['room'], booking.room.room_number)
+        self.assertEqual(self.client.get('/api/v1/audit/', {'to': start.isoformat()}).json()['count'], 0)
+
+    def test_bulk_cancel_and_overload_are_audited(self):
+        """Test bulk cancellations record room and slot, and gate rejections are audited"""
+        from unittest import mock
+        from .models import AuditEvents
+        from .throttling import AdmissionGate
+        from .utils import book_slot
+
+        booking = book_slot(slot_start=self.test_slot, room_type=RoomType.PRIVATE, users=[self.user1])
+        self.client.post(
+            '/api/v1/bookings/cancel-bulk/', {'booking_codes': [booking.booking_code]}, content_type='application/json'
+        )
+
+        event = AuditEvents.objects.get(action='cancel_bulk')
+        self.assertEqual((event.room, event.slot_start), (booking.room.room_number, self.test_slot))
+
+        gate = AdmissionGate(max_concurrent=1, max_queue=0, queue_timeout=0, retry_after=1)
+        with mock.patch('bookings.views.booking_gate', gate), gate.admit():
+            response = self.client.post(
+                '/api/v1/bookings/', {'slot': self.test_slot.isoformat(), 'room_type': RoomType.PRIVATE,
+                                      'user_ids': [self.user2.id]}, content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(AuditEvents.objects.filter(action='book', result='rejected').exists())
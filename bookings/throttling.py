@@ -0,0 +1,150 @@
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import SimpleRateThrottle
+
+DEFAULT_ADMISSION = {
+    'MAX_CONCURRENT': 4,
+    'MAX_QUEUE': 16,
+    'QUEUE_TIMEOUT': 2.0,
+    'RETRY_AFTER': 1,
+}
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Booking service is busy, please retry shortly."
+    default_code = 'overloaded'
+
+    def __init__(self, detail=None, wait=None):
+        super().__init__(detail)
+        # DRF's exception handler turns `wait` into a Retry-After header
+        self.wait = wait
+
+class AdmissionGate:
+    """
+    Bounded concurrency gate with a short wait queue for the booking write path.
+    Requests beyond max_concurrent wait up to queue_timeout seconds; once
+    max_queue requests are already waiting new ones are rejected immediately.
+    State and metrics are per process.
+    """
+    def __init__(self, max_concurrent, max_queue, queue_timeout, retry_after):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @classmethod
+    def from_settings(cls):
+        config = {**DEFAULT_ADMISSION, **getattr(settings, 'BOOKINGS_ADMISSION', {})}
+        return cls(
+            max_concurrent=config['MAX_CONCURRENT'],
+            max_queue=config['MAX_QUEUE'],
+            queue_timeout=config['QUEUE_TIMEOUT'],
+            retry_after=config['RETRY_AFTER'],
+        )
+
+    @contextmanager
+    def admit(self):
+        start = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.queue_depth >= self.max_queue:
+                    self.rejected_queue_full += 1
+                    raise Overloaded(wait=self.retry_after)
+                self.queue_depth += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self.queue_depth -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected_timeout += 1
+                raise Overloaded(wait=self.retry_after)
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.queue_timeout,
+                'in_flight': self.in_flight,
+                'queue_depth': self.queue_depth,
+                'admitted': self.admitted,
+                'rejected_queue_full': self.rejected_queue_full,
+                'rejected_timeout': self.rejected_timeout,
+                'avg_wait_ms': round(self.total_wait / self.admitted * 1000, 3) if self.admitted else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+            }
+
+booking_gate = AdmissionGate.from_settings()
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket per client: a rate of 'N/period' allows bursts of N requests
+    and refills at N tokens per period.
+    The read-refill-write of a bucket is serialised by one of LOCK_STRIPES locks
+    picked by cache key, so concurrent requests in one process cannot spend the
+    same token while different clients rarely wait on each other. With a cache
+    shared between processes the limit is approximate: each process may let
+    through a request that another one is concurrently spending.
+    """
+    LOCK_STRIPES = 64
+    _bucket_locks = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        with self._bucket_locks[hash(self.key) % self.LOCK_STRIPES]:
+            now = self.timer()
+            tokens, updated = self.cache.get(self.key, (self.num_requests, now))
+            self.tokens = min(self.num_requests, tokens + (now - updated) * self.num_requests / self.duration)
+            if self.tokens < 1:
+                return self.throttle_failure()
+            self.cache.set(self.key, (self.tokens - 1, now), self.duration)
+        return True
+
+    def wait(self):
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+class BookingReadThrottle(TokenBucketThrottle):
+    scope = 'booking_read'
+
+class BookingWriteThrottle(TokenBucketThrottle):
+    scope = 'booking_write'
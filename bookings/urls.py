@@ -1,13 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, TeamViewSet, BookingViewSet, available_rooms
+from .views import AuditEventViewSet, UserViewSet, TeamViewSet, BookingViewSet, available_rooms, next_available, utilization, admission_metrics
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet)
 router.register(r'teams', TeamViewSet)
 router.register(r'bookings', BookingViewSet, basename='booking')
+router.register(r'audit', AuditEventViewSet, basename='audit')
 
 urlpatterns = [
     path('rooms/available/', available_rooms, name='available-rooms'),
+    path('rooms/next-available/', next_available, name='next-available-rooms'),
+    path('analytics/utilization/', utilization, name='analytics-utilization'),
+    path('metrics/admission/', admission_metrics, name='admission-metrics'),
     path('', include(router.urls)),
     ]
\ No newline at end of file
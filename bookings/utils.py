@@ -1,13 +1,28 @@
 import uuid
 from datetime import timedelta
-from django.db import transaction
+from django.db import transaction, IntegrityError
 from django.db.models import Q, Count
-from .models import Users, Teams, Rooms, RoomType, Bookings, BookingAttendees
+from .analytics import local_day_start, queue_utilization_refresh
+from .models import Users, Teams, Rooms, RoomType, Bookings, BookingAttendees, UserNameTokens, UserSlots, tokenize_name
 
 class BookingError(Exception):
     pass
 
 ONE_HOUR = timedelta(hours=1)
+USER_SEARCH_MAX_RESULTS = 100
+CONFERENCE_MIN_ATTENDEES = 3
+
+def add_attendee(booking: Bookings, user: Users):
+    """
+    Adds a user to a booking and records the slot in the UserSlots index.
+    """
+    attendee = BookingAttendees.objects.create(booking=booking, user=user)
+    try:
+        UserSlots.objects.create(attendee=attendee, booking=booking, user=user, slot_start=booking.slot_start)
+    except IntegrityError:
+        # unique_user_slot catches a concurrent booking that slipped past the check in book_slot
+        raise BookingError("One or more users already have a booking in this slot.")
+    return attendee
 
 @transaction.atomic
 def book_slot(slot_start, room_type, users=None, team: Teams | None = None):
@@ -17,12 +32,12 @@ def book_slot(slot_start, room_type, users=None, team: Teams | None = None):
     team_members = list(team.members.all()) if team else []
     attendees = users or team_members
 
-    if room_type == RoomType.CONFERENCE and len(attendees) < 3:
-        raise BookingError("Conference room bookings require at least 3.")
+    if room_type == RoomType.CONFERENCE and len(attendees) < CONFERENCE_MIN_ATTENDEES:
+        raise BookingError(f"Conference room bookings require at least {CONFERENCE_MIN_ATTENDEES}.")
     
     #  Check attendees not already booked in this time slot
-    overlapping_qs = BookingAttendees.objects.filter(
-        booking__slot_start=slot_start,
+    overlapping_qs = UserSlots.objects.filter(
+        slot_start=slot_start,
         user__in=attendees,
     )
     if overlapping_qs.exists():
@@ -38,7 +53,8 @@ def book_slot(slot_start, room_type, users=None, team: Teams | None = None):
         )
 
         for user in attendees_list:
-            BookingAttendees.objects.create(booking=booking, user=user)
+            add_attendee(booking, user)
+        queue_utilization_refresh([(room.id, slot_start)])
         return booking
     
     # Private room booking
@@ -93,7 +109,8 @@ def book_slot(slot_start, room_type, users=None, team: Teams | None = None):
 
         for booking in existing:
             if booking.seat_count < booking.room.capacity:
-                BookingAttendees.objects.create(booking=booking, user=user)
+                add_attendee(booking, user)
+                queue_utilization_refresh([(booking.room_id, slot_start)])
                 return booking
             
         occupied_rooms_id = set(existing.values_list('room_id', flat=True))
@@ -111,17 +128,18 @@ def book_slot(slot_start, room_type, users=None, team: Teams | None = None):
 @transaction.atomic
 def cancel_booking(booking_code: str, user: Users | None = None):
     """
-    Cancels a booking using its unique booking_code.
+    Cancels a booking using its unique booking_code and returns the cancelled booking.
     """
     try:
-        booking = Bookings.objects.select_for_update().get(booking_code=booking_code)
+        booking = Bookings.objects.select_related('room').select_for_update(of=('self',)).get(booking_code=booking_code)
     except Bookings.DoesNotExist:
         raise BookingError("Booking Code not found.")
+    queue_utilization_refresh([(booking.room_id, booking.slot_start)])
     
     # Cancel entire booking if no user specified
     if user is None:
         booking.delete()
-        return
+        return booking
     # Cancel booking for specific user (Shared Desk scenario)
     deleted, _ = booking.attendees.filter(user=user).delete()
 
@@ -130,4 +148,107 @@ def cancel_booking(booking_code: str, user: Users | None = None):
     
     if booking.attendees.count() == 0:
         booking.delete()
-    
\ No newline at end of file
+    return booking
+    
+@transaction.atomic
+def cancel_bookings_bulk(booking_codes=None, team: Teams | None = None, user: Users | None = None,
+                         room: Rooms | None = None, date_from=None, date_to=None):
+    """
+    Cancels every booking matching the given filters using set-based deletes.
+    When a user is given only that user is removed from the matched bookings;
+    bookings left without attendees, or conference bookings left below
+    CONFERENCE_MIN_ATTENDEES, are cancelled.
+    """
+    bookings = Bookings.objects.all()
+    if booking_codes:
+        bookings = bookings.filter(booking_code__in=booking_codes)
+    if team is not None:
+        bookings = bookings.filter(team=team)
+    if room is not None:
+        bookings = bookings.filter(room=room)
+    if date_from is not None:
+        bookings = bookings.filter(slot_start__gte=local_day_start(date_from))
+    if date_to is not None:
+        bookings = bookings.filter(slot_start__lt=local_day_start(date_to + timedelta(days=1)))
+    if user is not None:
+        # unique_booking_user guarantees at most one joined row per booking
+        bookings = bookings.filter(attendees__user=user)
+
+    rows = list(bookings.select_for_update(of=('self',)).values_list(
+        'id', 'booking_code', 'room_id', 'room__room_number', 'slot_start'
+    ))
+    matched = {booking_id: code for booking_id, code, _, _, _ in rows}
+    queue_utilization_refresh((room_id, slot_start) for _, _, room_id, _, slot_start in rows)
+    results = {code: 'not_found' for code in booking_codes or []}
+    unmatched_codes = set(results) - set(matched.values())
+    if unmatched_codes:
+        # Requested codes that exist but were excluded by the other filters
+        for code in Bookings.objects.filter(booking_code__in=unmatched_codes).values_list('booking_code', flat=True):
+            results[code] = 'not_matched'
+    attendees_removed = 0
+
+    if user is None:
+        emptied_ids = list(matched)
+    else:
+        _, deleted = BookingAttendees.objects.filter(
+            booking_id__in=matched, user=user
+        ).delete()
+        attendees_removed = deleted.get(BookingAttendees._meta.label, 0)
+        emptied_ids = list(Bookings.objects.filter(id__in=matched).annotate(
+            headcount=Count('attendees')
+        ).filter(
+            Q(headcount=0) | Q(room__room_type=RoomType.CONFERENCE, headcount__lt=CONFERENCE_MIN_ATTENDEES)
+        ).values_list('id', flat=True))
+        for code in matched.values():
+            results[code] = 'user_removed'
+
+    if emptied_ids:
+        # Also drops the remaining attendees of conference bookings that fell below the minimum
+        _, deleted = BookingAttendees.objects.filter(booking_id__in=emptied_ids).delete()
+        attendees_removed += deleted.get(BookingAttendees._meta.label, 0)
+        Bookings.objects.filter(id__in=emptied_ids).delete()
+    for booking_id in emptied_ids:
+        results[matched[booking_id]] = 'cancelled'
+
+    return {
+        'results': results,
+        'bookings': {
+            code: {'room': room_number, 'slot_start': slot_start}
+            for _, code, _, room_number, slot_start in rows
+        },
+        'bookings_cancelled': len(emptied_ids),
+        'attendees_removed': attendees_removed,
+        'not_found': sum(1 for status in results.values() if status == 'not_found'),
+        'not_matched': sum(1 for status in results.values() if status == 'not_matched'),
+    }
+
+def filter_users_by_name(users, query: str):
+    """
+    Narrows `users` to those where every query token prefixes one of their name tokens.
+    A query without tokens matches nobody.
+    """
+    tokens = tokenize_name(query)
+    if not tokens:
+        return users.none()
+    for token in tokens:
+        # Range scan on user_token_idx; LIKE 'x%' is not index friendly on every backend
+        users = users.filter(id__in=UserNameTokens.objects.filter(
+            token__gte=token, token__lt=token + '\U0010ffff'
+        ).values('user_id'))
+    return users
+
+def search_users(query: str, limit: int = 20):
+    """
+    Case-insensitive prefix search over user name tokens.
+    Every query token must prefix one of the user's name tokens ("jo sm" matches "John Smith").
+    """
+    users = filter_users_by_name(Users.objects.all(), query)
+    return users.order_by('name', 'id')[:min(limit, USER_SEARCH_MAX_RESULTS)]
+
+def user_schedule(user: Users, start, end):
+    """
+    Returns the user's UserSlots rows in [start, end) with their booking and room.
+    """
+    return UserSlots.objects.filter(
+        user=user, slot_start__gte=start, slot_start__lt=end
+    ).select_related('booking__room').order_by('slot_start')
@@ -2,21 +2,129 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action, api_view
 from rest_framework.exceptions import ValidationError
-from django.utils.dateparse import parse_datetime
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime, parse_date
 from django.db.models import Q, Count
-from .models import Users, Teams, Rooms, Bookings, RoomType
-from .serializers import UserSerializer, TeamSerializer, BookingSerializer, CreateBookingSerializer
-from .utils import book_slot, cancel_booking, BookingError
+from .audit import audit_log, request_actor
+from .analytics import utilization_report, GROUP_BY_FIELDS
+from .availability import next_available_slots
+from .models import Users, Teams, Rooms, Bookings, RoomType, AuditEvents
+from .throttling import booking_gate, BookingReadThrottle, BookingWriteThrottle, Overloaded
+from .serializers import (
+    UserSerializer, TeamSerializer, BookingSerializer, CreateBookingSerializer, BulkCancelBookingSerializer,
+    UserScheduleSerializer, AuditEventSerializer,
+)
+from .utils import (
+    book_slot, cancel_booking, cancel_bookings_bulk, search_users, user_schedule, BookingError,
+    USER_SEARCH_MAX_RESULTS,
+)
+
+def parse_query_datetime(value, field, inclusive_date=False):
+    """
+    Parses an ISO datetime or date query parameter into an aware datetime.
+    With inclusive_date a date-only value means the end of that day, for use as an exclusive upper bound.
+    """
+    try:
+        # parse_datetime also accepts bare dates, so try the date form first
+        parsed_date = parse_date(value)
+        parsed = parse_datetime(value) if parsed_date is None else None
+    except ValueError:
+        raise ValidationError({field: "Invalid date or datetime."})
+    if parsed_date is None and parsed is None:
+        raise ValidationError({field: "Invalid date or datetime format."})
+    if parsed_date is not None:
+        if inclusive_date:
+            parsed_date += timedelta(days=1)
+        parsed = datetime.combine(parsed_date, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
 
 # Create your views here.
 class UserViewSet(viewsets.ModelViewSet):
     queryset = Users.objects.all()
     serializer_class = UserSerializer
 
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+        Search users by name prefix or fetch a batch of users by id.
+        Example:
+        GET /api/v1/users/search/?q=jo%20sm&limit=20
+        GET /api/v1/users/search/?ids=1,2,3
+        """
+        query = request.query_params.get('q', '')
+        ids_str = request.query_params.get('ids')
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        if limit < 1:
+            raise ValidationError({"limit": "Must be a positive integer."})
+
+        if ids_str:
+            try:
+                ids = [int(value) for value in ids_str.split(',') if value.strip()]
+            except ValueError:
+                raise ValidationError({"ids": "Must be a comma-separated list of integers."})
+            if len(ids) > USER_SEARCH_MAX_RESULTS:
+                raise ValidationError({"ids": f"At most {USER_SEARCH_MAX_RESULTS} ids per request."})
+            users = Users.objects.filter(id__in=ids).order_by('id')
+        elif query.strip():
+            users = search_users(query, limit=limit)
+        else:
+            raise ValidationError({"q": "Either q or ids query parameter is required."})
+
+        return Response({"results": UserSerializer(users, many=True).data}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], url_path='schedule')
+    def schedule(self, request, pk=None):
+        """
+        Return the user's bookings between from (default now) and to (default from + 7 days).
+        A date-only `to` includes that whole day.
+        Example:
+        GET /api/v1/users/1/schedule/?from=2025-10-13&to=2025-10-20
+        """
+        user = self.get_object()
+        from_str = request.query_params.get('from')
+        to_str = request.query_params.get('to')
+        start = parse_query_datetime(from_str, 'from') if from_str else timezone.now()
+        end = parse_query_datetime(to_str, 'to', inclusive_date=True) if to_str else start + timedelta(days=7)
+        if end <= start:
+            raise ValidationError({"to": "Must be after from."})
+
+        slots = user_schedule(user, start, end)
+        return Response({
+            "user_id": user.id,
+            "from": start,
+            "to": end,
+            "bookings": UserScheduleSerializer(slots, many=True).data,
+        }, status=status.HTTP_200_OK)
+
 class TeamViewSet(viewsets.ModelViewSet):
     queryset = Teams.objects.prefetch_related('members').all()
     serializer_class = TeamSerializer
 
+class AuditEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Audit trail of booking and cancellation attempts, newest first.
+    Filters: from, to (ISO date or datetime; a date-only `to` includes that day), action, result, booking_code.
+    """
+    serializer_class = AuditEventSerializer
+
+    def get_queryset(self):
+        queryset = AuditEvents.objects.order_by('-created_at', '-id')
+        params = self.request.query_params
+        if params.get('from'):
+            queryset = queryset.filter(created_at__gte=parse_query_datetime(params['from'], 'from'))
+        if params.get('to'):
+            queryset = queryset.filter(created_at__lt=parse_query_datetime(params['to'], 'to', inclusive_date=True))
+        for field in ('action', 'result', 'booking_code'):
+            if params.get(field):
+                queryset = queryset.filter(**{field: params[field]})
+        return queryset
+
 class BookingViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Bookings.objects.select_related('room', 'team').prefetch_related('attendees__user').all()
     serializer_class = BookingSerializer
@@ -24,7 +132,14 @@ class BookingViewSet(viewsets.ReadOnlyModelViewSet):
     def get_serializer_class(self):
         if self.action == 'create':
             return CreateBookingSerializer
+        if self.action == 'cancel_bulk':
+            return BulkCancelBookingSerializer
         return BookingSerializer
+
+    def get_throttles(self):
+        if self.action in ('create', 'cancel', 'cancel_bulk'):
+            return [BookingWriteThrottle()]
+        return [BookingReadThrottle()]
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -36,10 +151,20 @@ class BookingViewSet(viewsets.ReadOnlyModelViewSet):
 
         users = list(user_ids) if user_ids else []
         
+        audit = dict(
+            actor=request_actor(request), slot_start=slot_start,
+            user_ids=[user.id for user in users], team_id=team.id if team else None,
+        )
         try:
-            booking = book_slot(slot_start=slot_start, room_type=room_type, users=users, team=team)
+            with booking_gate.admit():
+                booking = book_slot(slot_start=slot_start, room_type=room_type, users=users, team=team)
+        except Overloaded as e:
+            audit_log.record('book', 'rejected', detail=str(e.detail), **audit)
+            raise
         except BookingError as e:
+            audit_log.record('book', 'rejected', detail=str(e), **audit)
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        audit_log.record('book', 'success', booking_code=booking.booking_code, room=booking.room.room_number, **audit)
         
         output_serializer = BookingSerializer(booking).data
         return Response({
@@ -66,12 +191,61 @@ class BookingViewSet(viewsets.ReadOnlyModelViewSet):
             except Users.DoesNotExist:
                 raise ValidationError({"user_id": "User not found."})
 
+        audit = dict(
+            actor=request_actor(request), booking_code=booking_code, user_ids=[user.id] if user else [],
+        )
         try:
-            cancel_booking(booking_code, user=user)
+            with booking_gate.admit():
+                booking = cancel_booking(booking_code, user=user)
+        except Overloaded as e:
+            audit_log.record('cancel', 'rejected', detail=str(e.detail), **audit)
+            raise
         except BookingError as e:
+            audit_log.record('cancel', 'rejected', detail=str(e), **audit)
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        audit_log.record(
+            'cancel', 'success', room=booking.room.room_number, slot_start=booking.slot_start,
+            team_id=booking.team_id, **audit
+        )
         
         return Response({"message": "Booking cancelled successfully."}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='cancel-bulk')
+    def cancel_bulk(self, request):
+        """
+        Cancel every booking matching the given filters
+        (booking_codes, team_id, user_id, room_id, date_from, date_to).
+        With user_id only that user is removed; bookings left empty are dropped.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        user = data.get('user_id')
+        audit = dict(
+            actor=request_actor(request), user_ids=[user.id] if user else [],
+            team_id=data['team_id'].id if data.get('team_id') else None,
+        )
+        try:
+            with booking_gate.admit():
+                summary = cancel_bookings_bulk(
+                    booking_codes=data.get('booking_codes'),
+                    team=data.get('team_id'),
+                    user=user,
+                    room=data.get('room_id'),
+                    date_from=data.get('date_from'),
+                    date_to=data.get('date_to'),
+                )
+        except Overloaded as e:
+            audit_log.record('cancel_bulk', 'rejected', detail=str(e.detail), **audit)
+            raise
+        for code, result in summary['results'].items():
+            booking = summary['bookings'].get(code, {})
+            audit_log.record(
+                'cancel_bulk', result, booking_code=code,
+                room=booking.get('room'), slot_start=booking.get('slot_start'), **audit
+            )
+        return Response(summary, status=status.HTTP_200_OK)
     
 @api_view(['GET'])
 def available_rooms(request):
@@ -108,4 +282,104 @@ def available_rooms(request):
         "private_rooms" : list(private_rooms.values('id', 'room_number', 'capacity')),
         "conference_rooms" : list(conference_rooms.values('id', 'room_number', 'capacity')),
         "shared_rooms" : shared_rooms_available
-    }, status=status.HTTP_200_OK)
\ No newline at end of file
+    }, status=status.HTTP_200_OK)
+
+def parse_query_int(request, field, default, minimum, maximum):
+    value = request.query_params.get(field)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({field: "Must be an integer."})
+    if not minimum <= value <= maximum:
+        raise ValidationError({field: f"Must be between {minimum} and {maximum}."})
+    return value
+
+@api_view(['GET'])
+def next_available(request):
+    """
+    Return the earliest slots with a room of the given type that fits the attendees.
+    Example:
+    GET /api/v1/rooms/next-available/?room_type=shared&after=2025-10-14T10:00:00&attendees=2
+    """
+    room_type = request.query_params.get('room_type')
+    if room_type not in RoomType.values:
+        return Response({"detail": "A valid room_type query parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+    after_str = request.query_params.get('after')
+    after = parse_query_datetime(after_str, 'after') if after_str else timezone.now()
+    # Mirror book_slot's headcount rules so every returned slot can actually be booked
+    if room_type == RoomType.CONFERENCE:
+        attendees = parse_query_int(request, 'attendees', 3, 1, 100)
+        if attendees < 3:
+            raise ValidationError({"attendees": "Conference room bookings require at least 3."})
+    else:
+        attendees = parse_query_int(request, 'attendees', 1, 1, 100)
+        if attendees != 1:
+            raise ValidationError({"attendees": "Private rooms and shared desks are booked for one user per request."})
+    limit = parse_query_int(request, 'limit', 5, 1, 50)
+    days = parse_query_int(request, 'days', 14, 1, 60)
+
+    slots = next_available_slots(room_type, after, attendees=attendees, limit=limit, days=days)
+    return Response({
+        "room_type": room_type,
+        "after": after,
+        "attendees": attendees,
+        "results": [
+            {
+                "slot": slot_start,
+                "rooms": [
+                    {"room_id": room.id, "room_number": room.room_number, "remaining_seats": remaining}
+                    for room, remaining in rooms
+                ],
+            }
+            for slot_start, rooms in slots
+        ],
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def utilization(request):
+    """
+    Return occupancy and seat utilization from the rollup table.
+    Example:
+    GET /api/v1/analytics/utilization/?from=2025-10-01&to=2025-10-31&group_by=room_type&room_type=shared
+    """
+    from_str = request.query_params.get('from')
+    to_str = request.query_params.get('to')
+    if not from_str or not to_str:
+        return Response({"detail": "from and to query parameters are required."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        date_from = parse_date(from_str)
+        date_to = parse_date(to_str)
+    except ValueError:
+        date_from = date_to = None
+    if not date_from or not date_to:
+        return Response({"detail": "Invalid date format for from/to."}, status=status.HTTP_400_BAD_REQUEST)
+    if date_from > date_to:
+        return Response({"detail": "from must be on or before to."}, status=status.HTTP_400_BAD_REQUEST)
+    if (date_to - date_from).days >= 366:
+        return Response({"detail": "Date range cannot exceed one year."}, status=status.HTTP_400_BAD_REQUEST)
+
+    group_by = request.query_params.get('group_by', 'room')
+    if group_by not in GROUP_BY_FIELDS:
+        return Response(
+            {"detail": f"group_by must be one of: {', '.join(GROUP_BY_FIELDS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    room_type = request.query_params.get('room_type')
+    if room_type and room_type not in RoomType.values:
+        return Response({"detail": "Invalid room_type."}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        "from": date_from,
+        "to": date_to,
+        "group_by": group_by,
+        "results": utilization_report(date_from, date_to, group_by=group_by, room_type=room_type),
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def admission_metrics(request):
+    """
+    Return admission gate metrics for the booking write path (per server process).
+    """
+    return Response(booking_gate.metrics(), status=status.HTTP_200_OK)
@@ -130,6 +130,19 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # Token bucket rates for bookings.throttling: burst of N, refilled at N per period
+    'DEFAULT_THROTTLE_RATES': {
+        'booking_read': '120/min',
+        'booking_write': '30/min',
+    },
+}
+
+# Admission control in front of booking writes (bookings.throttling.AdmissionGate)
+BOOKINGS_ADMISSION = {
+    'MAX_CONCURRENT': 4,
+    'MAX_QUEUE': 16,
+    'QUEUE_TIMEOUT': 2.0,  # seconds a request may wait for a slot before a 503
+    'RETRY_AFTER': 1,
 }
 
 SPECTACULAR_SETTINGS = {
@@ -137,4 +150,21 @@ SPECTACULAR_SETTINGS = {
     'DESCRIPTION': 'API documentation for room booking system',
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
-}
\ No newline at end of file
+}
+
+# Background job queue (bookings.jobs, `manage.py run_workers`)
+BOOKINGS_JOB_QUEUE = {
+    'WORKERS': 4,
+    'MODE': 'thread',  # 'thread' or 'process'
+    'BATCH_SIZE': 20,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 2.0,  # seconds, doubled on every attempt
+}
+
+# Write-behind audit log (bookings.audit): flushed every FLUSH_INTERVAL seconds or BATCH_SIZE events
+BOOKINGS_AUDIT = {
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,
+    'MAX_BUFFER': 10000,
+}